@@ -3,6 +3,7 @@
 
 from googleapiclient.discovery import build
 from pygauth import get_user_creds_file
+from tree_snapshot import TreeSnapshot
 
 
 class Drive:
@@ -136,6 +137,37 @@ class Drive:
         else:
             return tree
 
+    def snapshot(self, root=None):
+        """Take a snapshot of the directory tree from a root folder.
+
+        Unlike directory_tree(), every page of folders is fetched, and the result can
+        be saved, loaded and diffed against other snapshots without re-crawling.
+
+        Args:
+            root (file, optional): The file object of the parent folder. Defaults to
+            the shared drive if one is set, otherwise the root directory.
+
+        Returns:
+            (TreeSnapshot): The snapshot of the folders below root.
+        """
+        if root is None:
+            root = self.get(self.shared_drive[1] if self.shared_drive[0] else "root")
+
+        folders = []
+        page_token = None
+        while True:
+            files = self.search(
+                "mimeType = 'application/vnd.google-apps.folder' and trashed = false",
+                page_token,
+                page_size=1000,
+            )
+            folders.extend(files.get("files", []))
+            page_token = files.get("nextPageToken", None)
+            if page_token is None:
+                break
+
+        return TreeSnapshot.from_files(root, folders)
+
     def get(self, id):
         """Get a file object from its id.
 
@@ -0,0 +1,146 @@
+from array import array
+import struct
+import zlib
+
+import pytest
+
+from tree_snapshot import TreeSnapshot
+
+
+ROOT = {"id": "r", "name": "Root"}
+
+
+def folder(id, name, parent):
+    return {"id": id, "name": name, "parents": [parent]}
+
+
+def snapshot(*files):
+    return TreeSnapshot.from_files(ROOT, list(files))
+
+
+def test_round_trip():
+    old = snapshot(
+        folder("a", "A", "r"),
+        folder("b", "Bé", "a"),
+        folder("c", "C", "r"),
+    )
+    new = TreeSnapshot.loads(old.dumps())
+    assert new.ids == old.ids
+    assert new.names == old.names
+    assert list(new.parents) == list(old.parents)
+    assert new.path("b") == "Root/A/Bé"
+
+
+def test_save_and_load(tmp_path):
+    old = snapshot(folder("a", "A", "r"))
+    old.save(tmp_path / "tree.snapshot")
+    new = TreeSnapshot.load(tmp_path / "tree.snapshot")
+    assert new.ids == old.ids
+    assert new.parent("a") == "r"
+
+
+def test_diff():
+    old = snapshot(
+        folder("a", "A", "r"),
+        folder("b", "B", "a"),
+        folder("c", "C", "r"),
+        folder("d", "D", "r"),
+        folder("e", "E", "a"),
+    )
+    new = snapshot(
+        folder("a", "A2", "r"),
+        folder("b", "B", "r"),
+        folder("d", "D", "r"),
+        folder("e", "E2", "d"),
+        folder("f", "F", "d"),
+    )
+    changes = old.diff(new)
+    assert changes.added == ["f"]
+    assert changes.removed == ["c"]
+    assert sorted(changes.renamed) == [("a", "A", "A2"), ("e", "E", "E2")]
+    assert sorted(changes.moved) == [("b", "a", "r"), ("e", "a", "d")]
+
+
+def test_diff_unchanged():
+    old = snapshot(folder("a", "A", "r"))
+    assert old.diff(TreeSnapshot.loads(old.dumps())) == ([], [], [], [])
+
+
+def test_from_files_skips_unreachable_and_duplicates():
+    tree = snapshot(
+        folder("a", "A", "r"),
+        folder("a", "A", "r"),
+        folder("x", "X", "elsewhere"),
+        folder("y", "Y", "x"),
+        {"id": "z", "name": "Z"},
+    )
+    assert tree.ids == ["r", "a"]
+    assert "x" not in tree
+    assert "y" not in tree
+
+
+def test_from_files_parents_come_first():
+    tree = snapshot(
+        folder("c", "C", "b"),
+        folder("b", "B", "a"),
+        folder("a", "A", "r"),
+    )
+    assert tree.ids == ["r", "a", "b", "c"]
+    assert list(tree.parents) == [-1, 0, 1, 2]
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        b"",
+        b"GDT",
+        b"NOPE\x01\x00\x00\x00\x00",
+        snapshot(folder("a", "A", "r")).dumps()[:-3],
+        snapshot(folder("a", "A", "r")).dumps()[:12],
+    ],
+)
+def test_loads_rejects_damaged_input(data):
+    with pytest.raises(ValueError):
+        TreeSnapshot.loads(data)
+
+
+def pack(parents, strings):
+    return (
+        struct.pack(f"<4sBI{len(parents)}i", b"GDTS", 1, len(parents), *parents)
+        + zlib.compress(strings)
+    )
+
+
+def test_loads_rejects_bad_utf8():
+    with pytest.raises(ValueError):
+        TreeSnapshot.loads(pack([-1, 0], b"r\0\xff\0Root\0A"))
+
+
+@pytest.mark.parametrize(
+    "parents",
+    [
+        [0, 0, 0],
+        [-1, 1, 0],
+        [-1, -1, 0],
+        [-1, 2, 0],
+        [-1, 0, 5],
+    ],
+)
+def test_loads_rejects_invalid_parents(parents):
+    with pytest.raises(ValueError):
+        TreeSnapshot.loads(pack(parents, b"r\0a\0b\0Root\0A\0B"))
+
+
+def test_loads_accepts_packed_snapshot():
+    tree = TreeSnapshot.loads(pack([-1, 0, 1], b"r\0a\0b\0Root\0A\0B"))
+    assert tree.path("b") == "Root/A/B"
+
+
+def test_loads_rejects_duplicate_ids():
+    with pytest.raises(ValueError):
+        TreeSnapshot.loads(pack([-1, 0, 0], b"r\0a\0a\0Root\0A\0A"))
+
+
+def test_rejects_duplicate_ids():
+    with pytest.raises(ValueError):
+        TreeSnapshot(["r", "a", "a"], ["Root", "A", "A"], array("i", [-1, 0, 0]))
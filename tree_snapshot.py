@@ -0,0 +1,226 @@
+"""Compact, saveable snapshots of a Drive folder tree.
+
+A TreeSnapshot stores every folder once: its id and name are interned into flat lists
+and its parent is stored as an index into those lists, backed by an array. Folders are
+ordered breadth-first from the root, so a parent always comes before its children.
+
+Snapshots can be written to disk and loaded back without touching the Drive API, and
+two snapshots can be diffed to find added, removed, renamed and moved folders.
+"""
+
+
+from array import array
+from collections import namedtuple
+import struct
+import sys
+import zlib
+
+
+MAGIC = b"GDTS"
+VERSION = 1
+_HEADER = struct.Struct("<4sBI")
+
+TreeDiff = namedtuple("TreeDiff", ["added", "removed", "renamed", "moved"])
+TreeDiff.__doc__ = """The differences between two snapshots.
+
+    added (list): Ids of folders only in the new snapshot.
+    removed (list): Ids of folders only in the old snapshot.
+    renamed (list): (id, old_name, new_name) tuples.
+    moved (list): (id, old_parent_id, new_parent_id) tuples.
+"""
+
+
+class TreeSnapshot:
+    def __init__(self, ids, names, parents):
+        """Wrap already-interned folder data.
+
+        Index 0 is the root folder, whose parent index is -1. Use from_files() or
+        load() rather than building these lists by hand.
+
+        Args:
+            ids (list): Folder ids.
+            names (list): Folder names, matching ids.
+            parents (array): Parent index of each folder, typecode "i".
+        """
+        if not len(ids) == len(names) == len(parents):
+            raise ValueError("ids, names and parents must be the same length")
+        if len(parents) == 0 or parents[0] != -1:
+            raise ValueError("The first folder must be the root, with parent -1")
+        for i in range(1, len(parents)):
+            if not 0 <= parents[i] < i:
+                raise ValueError(f"Folder {ids[i]} has an invalid parent index")
+        self.ids = ids
+        self.names = names
+        self.parents = parents
+        self._index = {id: i for i, id in enumerate(ids)}
+        if len(self._index) != len(ids):
+            raise ValueError("Folder ids must be unique")
+
+    @classmethod
+    def from_files(cls, root, files):
+        """Build a snapshot from a list of folder file objects.
+
+        Folders that can't be reached from the root are left out.
+
+        Args:
+            root (file): The file object of the root folder, with id and name.
+            files (list): Folder file objects with the id, name, and parents properties.
+
+        Returns:
+            (TreeSnapshot): The snapshot of the tree below root.
+        """
+        children = {}
+        for file in files:
+            for parent in file.get("parents", [])[:1]:
+                children.setdefault(parent, []).append(file)
+
+        ids = [root["id"]]
+        names = [root["name"]]
+        parents = array("i", [-1])
+        seen = {root["id"]}
+        position = 0
+        while position < len(ids):
+            for file in sorted(
+                children.get(ids[position], []), key=lambda f: (f["name"], f["id"])
+            ):
+                if file["id"] in seen:
+                    continue
+                seen.add(file["id"])
+                ids.append(file["id"])
+                names.append(file["name"])
+                parents.append(position)
+            position += 1
+        return cls(ids, names, parents)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, id):
+        return id in self._index
+
+    def parent(self, id):
+        """Get the id of a folder's parent, or None for the root."""
+        index = self.parents[self._index[id]]
+        return None if index < 0 else self.ids[index]
+
+    def path(self, id, sep="/"):
+        """Get the path of a folder's names from the root down to the folder."""
+        parts = []
+        index = self._index[id]
+        while index >= 0:
+            parts.append(self.names[index])
+            index = self.parents[index]
+        return sep.join(reversed(parts))
+
+    def folder_ids(self):
+        """Get every folder id in the snapshot, for use with a Google query."""
+        return list(self.ids)
+
+    def print_tree(self):
+        """Print the directory structure, in the same layout as directory_tree()."""
+        children = {}
+        for index in range(1, len(self.ids)):
+            children.setdefault(self.parents[index], []).append(index)
+
+        stack = [(0, 0)]
+        while stack:
+            index, depth = stack.pop()
+            print(f"{' '*depth}{self.names[index]} [{self.ids[index]}]")
+            for child in reversed(children.get(index, [])):
+                stack.append((child, depth + 4))
+
+    def diff(self, new):
+        """Compare this snapshot against a newer one.
+
+        Args:
+            new (TreeSnapshot): The newer snapshot.
+
+        Returns:
+            (TreeDiff): The added, removed, renamed and moved folders.
+        """
+        added = [id for id in new.ids if id not in self._index]
+        removed = [id for id in self.ids if id not in new._index]
+        renamed = []
+        moved = []
+        for old_index, id in enumerate(self.ids):
+            new_index = new._index.get(id)
+            if new_index is None:
+                continue
+            if self.names[old_index] != new.names[new_index]:
+                renamed.append((id, self.names[old_index], new.names[new_index]))
+            old_parent = self.parents[old_index]
+            new_parent = new.parents[new_index]
+            old_parent = None if old_parent < 0 else self.ids[old_parent]
+            new_parent = None if new_parent < 0 else new.ids[new_parent]
+            if old_parent != new_parent:
+                moved.append((id, old_parent, new_parent))
+        return TreeDiff(added, removed, renamed, moved)
+
+    def dumps(self):
+        """Serialize the snapshot to bytes.
+
+        The layout is a small header, the little-endian parent index array, and the
+        zlib-compressed ids and names, separated by null characters.
+
+        Returns:
+            (bytes): The serialized snapshot.
+        """
+        parents = array("i", self.parents)
+        if sys.byteorder == "big":
+            parents.byteswap()
+        strings = "\0".join(self.ids + self.names).encode("utf-8")
+        return b"".join(
+            [
+                _HEADER.pack(MAGIC, VERSION, len(self.ids)),
+                parents.tobytes(),
+                zlib.compress(strings),
+            ]
+        )
+
+    @classmethod
+    def loads(cls, data):
+        """Load a snapshot serialized by dumps().
+
+        Args:
+            data (bytes): The serialized snapshot.
+
+        Raises:
+            ValueError: If the data is not a valid snapshot.
+
+        Returns:
+            (TreeSnapshot): The loaded snapshot.
+        """
+        try:
+            magic, version, count = _HEADER.unpack_from(data)
+        except struct.error:
+            raise ValueError("Corrupt directory tree snapshot")
+        if magic != MAGIC:
+            raise ValueError("Not a directory tree snapshot")
+        if version != VERSION:
+            raise ValueError(f"Unsupported snapshot version {version}")
+
+        parents = array("i")
+        start = _HEADER.size
+        end = start + count * parents.itemsize
+        parents.frombytes(data[start:end])
+        if sys.byteorder == "big":
+            parents.byteswap()
+
+        try:
+            strings = zlib.decompress(data[end:]).decode("utf-8").split("\0")
+        except (zlib.error, UnicodeDecodeError):
+            raise ValueError("Corrupt directory tree snapshot")
+        if len(strings) != 2 * count:
+            raise ValueError("Corrupt directory tree snapshot")
+        return cls(strings[:count], strings[count:], parents)
+
+    def save(self, path):
+        """Write the snapshot to a file."""
+        with open(path, "wb") as f:
+            f.write(self.dumps())
+
+    @classmethod
+    def load(cls, path):
+        """Read a snapshot from a file written by save()."""
+        with open(path, "rb") as f:
+            return cls.loads(f.read())